@@ -1,20 +1,55 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import atexit
 import json
+import mmap
+import os
+import pickle
 import random
+import shutil
 import sys
+import textwrap
+from array import array
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Question:
     id: int
     text: str
     options: List[str]
-    correct_indices: List[int]
+    # Bit i ustawiony - odpowiedź i jest poprawna
+    correct_mask: int
+
+
+# Klawisz (bajty z terminala) -> akcja; strzałki jako sekwencje ANSI
+# (CSI i SS3) oraz kody msvcrt na Windows
+_KEY_MAP = {
+    b'\x1b[A': 'up',
+    b'\x1b[B': 'down',
+    b'\x1bOA': 'up',
+    b'\x1bOB': 'down',
+    b'\xe0H': 'up',
+    b'\xe0P': 'down',
+    b'\x00H': 'up',
+    b'\x00P': 'down',
+    b'k': 'up',
+    b'j': 'down',
+    b'\r': 'enter',
+    b' ': 'space',
+    b'\x1b': 'esc',
+}
+
+# Czyszczenie ekranu i kursor w lewym górnym rogu
+_CLEAR = '\x1b[2J\x1b[H'
+# Ukrycie kursora i wyłączenie zawijania (wiersze zawija _render_lines)
+# oraz przywrócenie ich wraz z domyślnymi atrybutami tekstu
+_HIDE_CURSOR = '\x1b[?25l\x1b[?7l'
+_SHOW_CURSOR = '\x1b[?25h\x1b[?7h\x1b[0m'
 
 
 class QuestionParser:
@@ -24,50 +59,72 @@ class QuestionParser:
     def parse_questions(filepath: Path) -> Dict[int, Question]:
         """Parsuje pytania z pliku DAT"""
         questions = {}
-        
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                parts = line.split(' ', 1)
-                if len(parts) < 2:
-                    continue
-                
-                try:
-                    q_id = int(parts[0])
-                except ValueError:
-                    continue
-                
-                text_and_options = parts[1]
-                # Rozdzielanie pytania od odpowiedzi
-                segments = text_and_options.split('*')
-                
-                if len(segments) < 2:
-                    continue
-                
-                question_text = segments[0]
-                options = []
-                correct_indices = []
-                
-                for idx, seg in enumerate(segments[1:]):
-                    if seg.startswith('[X]'):
-                        options.append(seg[3:])
-                        correct_indices.append(len(options) - 1)
-                    else:
-                        options.append(seg)
-                
-                if options:
+        # Pula napisów - powtarzające się odpowiedzi są dekodowane raz
+        # i współdzielą jeden obiekt str
+        pool: Dict[bytes, str] = {}
+
+        def decode(raw: bytes) -> str:
+            text = pool.get(raw)
+            if text is None:
+                text = pool[raw] = raw.decode('utf-8')
+            return text
+
+        # Plik mapowany w pamięci i skanowany w trybie binarnym - znaczniki
+        # (cyfry, spacja, '*', '[X]') są ASCII, więc dekodowane są tylko gotowe pola
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return questions
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                for q_id, text, options, correct_mask in QuestionParser._scan_records(buf):
                     questions[q_id] = Question(
                         id=q_id,
-                        text=question_text,
-                        options=options,
-                        correct_indices=correct_indices
+                        text=decode(text),
+                        options=[decode(option) for option in options],
+                        correct_mask=correct_mask
                     )
-        
+
         return questions
 
+    @staticmethod
+    def _scan_records(buf: mmap.mmap) -> Iterator[Tuple[int, bytes, List[bytes], int]]:
+        """Dzieli treść pliku DAT na rekordy (id, treść, odpowiedzi, maska poprawnych)"""
+        pos = 0
+        size = len(buf)
+
+        while pos < size:
+            eol = buf.find(b'\n', pos)
+            if eol == -1:
+                eol = size
+            line = buf[pos:eol].strip()
+            pos = eol + 1
+
+            # Linia pytania: "<id> <treść>*odp*[X]odp..."
+            space = line.find(b' ')
+            if space == -1 or not line[:space].isdigit():
+                continue
+
+            # Treść pytania do pierwszej gwiazdki, bez gwiazdki brak odpowiedzi
+            star = line.find(b'*', space + 1)
+            if star == -1:
+                continue
+
+            text = line[space + 1:star]
+            options = []
+            correct_mask = 0
+
+            # Kolejne odpowiedzi, poprawne oznaczone prefiksem [X]
+            while star != -1:
+                start = star + 1
+                star = line.find(b'*', start)
+                option = line[start:] if star == -1 else line[start:star]
+                if option.startswith(b'[X]'):
+                    correct_mask |= 1 << len(options)
+                    option = option[3:]
+                options.append(option)
+
+            yield int(line[:space]), text, options, correct_mask
+
 
 class ModuleLoader:
     """Loader modułów z JSON"""
@@ -75,8 +132,8 @@ class ModuleLoader:
     @staticmethod
     def load_modules(filepath: Path) -> Dict[int, Dict]:
         """Wczytuje moduły z pliku JSON"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # json.loads przyjmuje bajty (UTF-8) bez warstwy TextIOWrapper
+        data = json.loads(filepath.read_bytes())
         
         modules = {}
         for module in data['modules']:
@@ -88,124 +145,225 @@ class ModuleLoader:
         return modules
 
 
+# Podbić przy zmianie struktury Question, aby unieważnić stare pliki .pkl
+_CACHE_VERSION = 3
+
+
+def load_cached(source: Path, loader: Callable[[Path], Any]) -> Any:
+    """Wczytuje dane przez loader, korzystając z cache .pkl obok pliku źródłowego"""
+    cache = source.with_suffix('.pkl')
+
+    try:
+        if cache.stat().st_mtime >= source.stat().st_mtime:
+            version, data = pickle.loads(cache.read_bytes())
+            if version == _CACHE_VERSION:
+                return data
+    except Exception:
+        # Brak, uszkodzony lub nieaktualny cache - parsujemy od nowa
+        pass
+
+    data = loader(source)
+    try:
+        cache.write_bytes(pickle.dumps((_CACHE_VERSION, data), protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass
+    return data
+
+
+@lru_cache(maxsize=1024)
+def _wrap(line: str, width: int) -> Tuple[str, ...]:
+    """Zawija wiersz do szerokości terminala (pusty wiersz to jeden pusty wiersz ekranu)"""
+    return tuple(textwrap.wrap(line, width)) or ('',)
+
+
 class Quiz:
     """Aplikacja do nauki pytań"""
     
+    # Stałe fragmenty ekranów, składane w ramki bez tworzenia nowych napisów
+    _SEP = "=" * 60
+    _HINT_MENU = "Użyj strzałek ↑↓ lub jk, Enter aby wybrać, ESC aby wyjść"
+    _HINT_MODULE = "Użyj strzałek ↑↓ lub jk, Enter aby wybrać, ESC aby wróć"
+    _HINT_QUESTION = "Użyj strzałek ↑↓ lub jk, SPACE aby zaznaczyć, Enter aby potwierdzić, ESC aby wyjść"
+    _MODE_HEADER = (_SEP, "WYBIERZ TRYB NAUKI", _SEP, "")
+    _MODULE_HEADER = (_SEP, "WYBIERZ MODUŁ", _SEP, "")
+    _MODE_OPTIONS = (
+        "1. Losowe pytania (wszystkie)",
+        "2. Pytania z wybranego modułu",
+        "3. Wyjście"
+    )
+    # Wiersz menu w wersji (niewybrany, wybrany)
+    _MODE_ROWS = tuple((f"  {opt}", f"→ {opt}") for opt in _MODE_OPTIONS)
+    # Znacznik i pole wyboru odpowiedzi, indeks: 2 * wybrana + zaznaczona
+    _ANSWER_MARKS = ("  [ ]", "  [x]", "→ [ ]", "→ [x]")
+    
     def __init__(self, questions: Dict[int, Question], modules: Dict[int, Dict]):
         self.questions = questions
         self.modules = modules
+        # Pytania adresowane pozycją w liście; moduły trzymają tablice pozycji
+        # (pytania spoza pliku DAT są pomijane już tutaj)
+        self._questions_by_pos = list(questions.values())
+        self._id_to_pos = {q.id: pos for pos, q in enumerate(self._questions_by_pos)}
+        self._module_positions = {
+            m_id: array('i', (self._id_to_pos[q_id] for q_id in module['questions'] if q_id in self._id_to_pos))
+            for m_id, module in modules.items()
+        }
         self.current_index = 0
-        self.quiz_questions = []
+        self.quiz_questions = array('i')
         self.stats = {'correct': 0, 'wrong': 0, 'total': 0}
+        # Ostatnio narysowane wiersze ekranu (None - stan ekranu nieznany)
+        self._last_lines = None
+        self._last_size = None
+        self._old_tty = None
+        self._cursor_hidden = False
+        # Bajty odczytane z terminala, ale jeszcze nie zużyte przez _read_key
+        self._pending = b''
+        self._enter_raw_mode()
+        self._hide_cursor()
+        atexit.register(self.restore_terminal)
     
-    def select_mode(self) -> Tuple[List[int], str] | None:
-        """Pozwala wybrać tryb: losowe pytania czy z modułu"""
-        self.clear_screen()
-        print("=" * 60)
-        print("QUIZ - SYSTEM NAUKI PYTAŃ EGZAMINACYJNYCH")
-        print("=" * 60)
-        print()
+    def _enter_raw_mode(self):
+        """Włącza tryb raw terminala na całą sesję (POSIX)"""
+        if sys.platform == 'win32' or not sys.stdin.isatty():
+            return
         
-        options = [
-            "1. Losowe pytania (wszystkie)",
-            "2. Pytania z wybranego modułu",
-            "3. Wyjście"
-        ]
+        import termios
+        import tty
+        
+        fd = sys.stdin.fileno()
+        self._old_tty = termios.tcgetattr(fd)
+        tty.setraw(fd)
+    
+    def _hide_cursor(self):
+        """Ukrywa kursor i wyłącza zawijanie wierszy na całą sesję"""
+        if not sys.stdout.isatty():
+            return
+        
+        sys.stdout.write(_HIDE_CURSOR)
+        sys.stdout.flush()
+        self._cursor_hidden = True
+    
+    def restore_terminal(self):
+        """Przywraca ustawienia terminala sprzed uruchomienia quizu"""
+        if self._cursor_hidden:
+            # Kursor za ostatnim wierszem ramki, aby dalszy tekst nie nadpisał ekranu
+            if self._last_lines:
+                sys.stdout.write(f'\x1b[{len(self._last_lines)};1H\r\n')
+            sys.stdout.write(_SHOW_CURSOR)
+            sys.stdout.flush()
+            self._cursor_hidden = False
+        
+        if self._old_tty is None:
+            return
+        
+        import termios
+        
+        termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self._old_tty)
+        self._old_tty = None
+    
+    def select_mode(self) -> Tuple[Sequence[int], str] | None:
+        """Pozwala wybrać tryb: losowe pytania czy z modułu"""
+        options = self._MODE_OPTIONS
         
         selected = 0
+        
+        # Ramka rysowana tylko po zmianie stanu (nieznany klawisz nic nie rysuje)
+        dirty = True
         while True:
-            self.clear_screen()
-            print("=" * 60)
-            print("WYBIERZ TRYB NAUKI")
-            print("=" * 60)
-            print()
-            
-            for idx, opt in enumerate(options):
-                marker = "→ " if idx == selected else "  "
-                print(f"{marker}{opt}")
-            
-            print()
-            print("Użyj strzałek ↑↓ lub jk, Enter aby wybrać, ESC aby wyjść")
+            if dirty:
+                lines = list(self._MODE_HEADER)
+                
+                for idx, rows in enumerate(self._MODE_ROWS):
+                    lines.append(rows[idx == selected])
+                
+                lines.extend(("", self._HINT_MENU))
+                self._render_lines(lines)
+                dirty = False
             
             key = self.get_arrow_key()
             
             if key == 'up':
                 selected = (selected - 1) % len(options)
+                dirty = True
             elif key == 'down':
                 selected = (selected + 1) % len(options)
+                dirty = True
             elif key == 'enter':
                 break
             elif key == 'esc':
                 return None
         
         if selected == 0:
-            q_ids = list(self.questions.keys())
+            positions = range(len(self._questions_by_pos))
             mode = "Losowe pytania"
         elif selected == 1:
             module_id = self.select_module()
             if module_id is None:
                 return self.select_mode()
-            q_ids = self.modules[module_id]['questions']
+            positions = self._module_positions[module_id]
             mode = f"Moduł: {self.modules[module_id]['name']}"
         else:  # selected == 2
             return None
         
-        return q_ids, mode
+        return positions, mode
     
     def select_module(self) -> int | None:
         """Pozwala wybrać moduł"""
         module_list = sorted(self.modules.keys())
         selected = 0
         
+        module_rows = []
+        for m_id in module_list:
+            name = self.modules[m_id]['name']
+            count = len(self._module_positions[m_id])
+            row = f"[{m_id}] {name} ({count} pytań)"
+            module_rows.append((f"  {row}", f"→ {row}"))
+        
+        dirty = True
         while True:
-            self.clear_screen()
-            print("=" * 60)
-            print("WYBIERZ MODUŁ")
-            print("=" * 60)
-            print()
-            
-            for idx, m_id in enumerate(module_list):
-                marker = "→ " if idx == selected else "  "
-                name = self.modules[m_id]['name']
-                count = len(self.modules[m_id]['questions'])
-                print(f"{marker}[{m_id}] {name} ({count} pytań)")
-            
-            print()
-            print("Użyj strzałek ↑↓ lub jk, Enter aby wybrać, ESC aby wróć")
+            if dirty:
+                lines = list(self._MODULE_HEADER)
+                
+                for idx, rows in enumerate(module_rows):
+                    lines.append(rows[idx == selected])
+                
+                lines.extend(("", self._HINT_MODULE))
+                self._render_lines(lines)
+                dirty = False
             
             key = self.get_arrow_key()
             
             if key == 'up':
                 selected = (selected - 1) % len(module_list)
+                dirty = True
             elif key == 'down':
                 selected = (selected + 1) % len(module_list)
+                dirty = True
             elif key == 'enter':
                 return module_list[selected]
             elif key == 'esc':
                 return None
     
-    def run_quiz(self, question_ids: List[int]):
-        """Uruchamia quiz"""
-        self.quiz_questions = random.sample(question_ids, min(len(question_ids), len(question_ids)))
+    def run_quiz(self, positions: Sequence[int], k: int | None = None):
+        """Uruchamia quiz (k - limit liczby pytań, None - wszystkie)"""
+        # Pozycje są już zweryfikowane w __init__, pętla nie sprawdza przynależności
+        if k is None or k >= len(positions):
+            self.quiz_questions = array('i', positions)
+            random.shuffle(self.quiz_questions)
+        else:
+            self.quiz_questions = array('i', random.sample(positions, k))
         self.current_index = 0
         self.stats = {'correct': 0, 'wrong': 0, 'total': len(self.quiz_questions)}
         
         while self.current_index < len(self.quiz_questions):
-            q_id = self.quiz_questions[self.current_index]
-            
-            if q_id not in self.questions:
-                self.current_index += 1
-                continue
+            question = self._questions_by_pos[self.quiz_questions[self.current_index]]
+            user_mask = self.show_question(question, self.current_index + 1)
             
-            question = self.questions[q_id]
-            user_answers = self.show_question(question, self.current_index + 1)
-            
-            if user_answers is None:  # Wciśnięto ESC
+            if user_mask is None:  # Wciśnięto ESC
                 self.show_exit_confirmation()
                 break
             
-            is_correct = self.check_answers(user_answers, question.correct_indices)
-            self.show_result(is_correct, question, user_answers)
+            is_correct = self.check_answers(user_mask, question.correct_mask)
+            self.show_result(is_correct, question, user_mask)
             
             if is_correct:
                 self.stats['correct'] += 1
@@ -216,75 +374,75 @@ class Quiz:
         
         self.show_summary()
     
-    def show_question(self, question: Question, number: int) -> List[int] | None:
-        """Wyświetla pytanie i pozwala wybrać odpowiedzi (może być wiele)"""
+    def show_question(self, question: Question, number: int) -> int | None:
+        """Wyświetla pytanie i pozwala wybrać odpowiedzi (może być wiele), zwraca maskę bitową"""
         selected = 0
-        checked = set()
+        checked = 0
+        
+        # Nagłówek i wszystkie warianty wierszy odpowiedzi budowane raz na pytanie
+        header = (
+            self._SEP,
+            f"PYTANIE {number}/{len(self.quiz_questions)}",
+            self._SEP,
+            "",
+            f"ID: {question.id}",
+            "",
+            f"Treść: {question.text}",
+            "",
+            "Odpowiedzi:",
+            "",
+        )
+        option_rows = [
+            tuple(f" {mark} [{idx + 1}] {option}" for mark in self._ANSWER_MARKS)
+            for idx, option in enumerate(question.options)
+        ]
         
+        dirty = True
         while True:
-            self.clear_screen()
-            print("=" * 60)
-            print(f"PYTANIE {number}/{len(self.quiz_questions)}")
-            print("=" * 60)
-            print()
-            print(f"ID: {question.id}")
-            print()
-            print(f"Treść: {question.text}")
-            print()
-            print("Odpowiedzi:")
-            print()
-            
-            for idx, option in enumerate(question.options):
-                is_selected = idx == selected
-                is_checked = idx in checked
+            if dirty:
+                lines = list(header)
                 
-                marker = "→" if is_selected else " "
-                checkbox = "[x]" if is_checked else "[ ]"
+                for idx, rows in enumerate(option_rows):
+                    lines.append(rows[2 * (idx == selected) + (checked >> idx & 1)])
                 
-                print(f" {marker} {checkbox} [{idx + 1}] {option}")
-            
-            print()
-            print("Użyj strzałek ↑↓ lub jk, SPACE aby zaznaczyć, Enter aby potwierdzić, ESC aby wyjść")
+                lines.extend(("", self._HINT_QUESTION))
+                self._render_lines(lines)
+                dirty = False
             
             key = self.get_arrow_key()
             
             if key == 'up':
                 selected = (selected - 1) % len(question.options)
+                dirty = True
             elif key == 'down':
                 selected = (selected + 1) % len(question.options)
+                dirty = True
             elif key == 'space':
-                if selected in checked:
-                    checked.remove(selected)
-                else:
-                    checked.add(selected)
+                checked ^= 1 << selected
+                dirty = True
             elif key == 'enter':
                 if checked:
-                    return list(checked)
+                    return checked
             elif key == 'esc':
                 return None
     
-    def show_result(self, is_correct: bool, question: Question, user_answers: List[int] = None):
+    def show_result(self, is_correct: bool, question: Question, user_mask: int = 0):
         """Wyświetla wynik odpowiedzi"""
-        self.clear_screen()
-        print("=" * 60)
-        
-        if is_correct:
-            print("✓ POPRAWNA ODPOWIEDŹ!")
-            print("=" * 60)
-        else:
-            print("✗ BŁĘDNA ODPOWIEDŹ")
-            print("=" * 60)
-        
-        print()
-        print(f"ID: {question.id}")
-        print()
-        print(f"Treść pytania: {question.text}")
-        print()
-        print("Odpowiedzi:")
+        lines = [
+            self._SEP,
+            "✓ POPRAWNA ODPOWIEDŹ!" if is_correct else "✗ BŁĘDNA ODPOWIEDŹ",
+            self._SEP,
+            "",
+            f"ID: {question.id}",
+            "",
+            f"Treść pytania: {question.text}",
+            "",
+            "Odpowiedzi:",
+        ]
         
         for idx, option in enumerate(question.options):
-            is_correct_answer = idx in question.correct_indices
-            was_selected = user_answers and idx in user_answers
+            is_correct_answer = question.correct_mask >> idx & 1
+            was_selected = user_mask >> idx & 1
             
             if is_correct_answer and was_selected:
                 marker = "✓✓"
@@ -295,111 +453,109 @@ class Quiz:
             else:
                 marker = "  "
             
-            print(f"  {marker} [{idx + 1}] {option}")
+            lines.append(f"  {marker} [{idx + 1}] {option}")
         
-        print()
-        print("Naciśnij Enter aby kontynuować...")
+        lines.append("")
+        lines.append("Naciśnij Enter aby kontynuować...")
+        self._render_lines(lines)
         self.wait_for_enter()
     
-    def check_answers(self, user_answers: List[int], correct_indices: List[int]) -> bool:
+    def check_answers(self, user_mask: int, correct_mask: int) -> bool:
         """Sprawdza czy odpowiedzi są poprawne"""
-        return set(user_answers) == set(correct_indices)
+        return user_mask == correct_mask
     
     def show_summary(self):
         """Wyświetla podsumowanie quizu"""
-        self.clear_screen()
-        print("=" * 60)
-        print("PODSUMOWANIE")
-        print("=" * 60)
-        print()
-        print(f"Łącznie pytań: {self.stats['total']}")
-        print(f"Poprawne: {self.stats['correct']} ({int(self.stats['correct']/self.stats['total']*100) if self.stats['total'] > 0 else 0}%)")
-        print(f"Błędne: {self.stats['wrong']} ({int(self.stats['wrong']/self.stats['total']*100) if self.stats['total'] > 0 else 0}%)")
-        print()
+        lines = [
+            self._SEP,
+            "PODSUMOWANIE",
+            self._SEP,
+            "",
+            f"Łącznie pytań: {self.stats['total']}",
+            f"Poprawne: {self.stats['correct']} ({int(self.stats['correct']/self.stats['total']*100) if self.stats['total'] > 0 else 0}%)",
+            f"Błędne: {self.stats['wrong']} ({int(self.stats['wrong']/self.stats['total']*100) if self.stats['total'] > 0 else 0}%)",
+            "",
+        ]
         
         if self.stats['correct'] / self.stats['total'] >= 0.8:
-            print("Doskonale! 🎉")
+            lines.append("Doskonale! 🎉")
         elif self.stats['correct'] / self.stats['total'] >= 0.6:
-            print("Dobrze! 👍")
+            lines.append("Dobrze! 👍")
         else:
-            print("Warto ćwiczyć! 📚")
+            lines.append("Warto ćwiczyć! 📚")
         
-        print()
-        print("Naciśnij Enter aby wróć do menu...")
+        lines.append("")
+        lines.append("Naciśnij Enter aby wróć do menu...")
+        self._render_lines(lines)
         self.wait_for_enter()
     
     def show_exit_confirmation(self):
         """Potwierdza wyjście"""
-        self.clear_screen()
-        print("=" * 60)
-        print("OPUSZCZANIE QUIZU")
-        print("=" * 60)
-        print()
-        print(f"Odpowiedziałeś na {self.current_index} z {len(self.quiz_questions)} pytań")
-        print(f"Poprawne: {self.stats['correct']}")
-        print(f"Błędne: {self.stats['wrong']}")
-        print()
-        print("Naciśnij Enter aby wrócić do menu...")
+        self._render_lines([
+            self._SEP,
+            "OPUSZCZANIE QUIZU",
+            self._SEP,
+            "",
+            f"Odpowiedziałeś na {self.current_index} z {len(self.quiz_questions)} pytań",
+            f"Poprawne: {self.stats['correct']}",
+            f"Błędne: {self.stats['wrong']}",
+            "",
+            "Naciśnij Enter aby wrócić do menu...",
+        ])
         self.wait_for_enter()
     
-    @staticmethod
-    def clear_screen():
+    def clear_screen(self):
         """Czyści ekran"""
-        import os
-        os.system('cls' if sys.platform == 'win32' else 'clear')
+        sys.stdout.write(_CLEAR)
+        sys.stdout.flush()
+        self._last_lines = None
     
-    @staticmethod
-    def get_arrow_key() -> str:
+    def _render_lines(self, lines: List[str]):
+        """Rysuje ekran, nadpisując tylko wiersze zmienione od poprzedniego rysowania"""
+        size = shutil.get_terminal_size()
+        # Zawijanie do szerokości terminala, aby indeks wiersza = wiersz ekranu
+        screen = []
+        for line in lines:
+            screen.extend(_wrap(line, size.columns))
+        
+        if self._last_lines is None or self._last_size != size or len(screen) > size.lines:
+            # Czyszczenie i cała ramka w jednym zapisie
+            sys.stdout.write(_CLEAR + '\r\n'.join(screen))
+            sys.stdout.flush()
+            # Ekran przewinięty - następne rysowanie musi być pełne
+            fits = len(screen) <= size.lines
+            self._last_lines = screen if fits else None
+            self._last_size = size
+            return
+        
+        last = self._last_lines
+        out = []
+        for i, row in enumerate(screen):
+            if i >= len(last) or last[i] != row:
+                out.append(f'\x1b[{i + 1};1H\x1b[2K{row}')
+        if len(last) > len(screen):
+            out.append(f'\x1b[{len(screen) + 1};1H\x1b[J')
+        
+        if out:
+            sys.stdout.write(''.join(out))
+            sys.stdout.flush()
+        self._last_lines = screen
+    
+    def get_arrow_key(self) -> str:
         """Pobiera klawisz (strzałki, Enter, ESC, Space)"""
         if sys.platform == 'win32':
             import msvcrt
             key = msvcrt.getch()
-            if key == b'\xe0':
-                key2 = msvcrt.getch()
-                if key2 == b'H':
-                    return 'up'
-                elif key2 == b'P':
-                    return 'down'
-            elif key == b'\r':
-                return 'enter'
-            elif key == b'\x1b':
-                return 'esc'
-            elif key == b' ':
-                return 'space'
-            elif key == b'j':
-                return 'down'
-            elif key == b'k':
-                return 'up'
+            # Klawisze specjalne (strzałki) to prefiks i drugi bajt
+            if key in (b'\xe0', b'\x00'):
+                key += msvcrt.getch()
         else:
-            import termios
-            import tty
-            
-            fd = sys.stdin.fileno()
-            old_settings = termios.tcgetattr(fd)
-            try:
-                tty.setraw(fd)
-                key = sys.stdin.read(1)
-                
-                if key == '\x1b':
-                    next1 = sys.stdin.read(1)
-                    if next1 == '[':
-                        next2 = sys.stdin.read(1)
-                        if next2 == 'A':
-                            return 'up'
-                        elif next2 == 'B':
-                            return 'down'
-                    return 'esc'
-                elif key == '\r':
-                    return 'enter'
-                elif key == ' ':
-                    return 'space'
-            finally:
-                termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+            key = self._read_key()
         
-        return ''
+        # key to zawsze dokładnie jeden klawisz, nieobsługiwane są pomijane
+        return _KEY_MAP.get(key, '')
     
-    @staticmethod
-    def wait_for_enter():
+    def wait_for_enter(self):
         """Czeka na Enter"""
         if sys.platform == 'win32':
             import msvcrt
@@ -408,32 +564,67 @@ class Quiz:
                 if key == b'\r':
                     break
         else:
-            import termios
-            import tty
-            
-            fd = sys.stdin.fileno()
-            old_settings = termios.tcgetattr(fd)
-            try:
-                tty.setraw(fd)
-                while True:
-                    key = sys.stdin.read(1)
-                    if key == '\r':
-                        break
-            finally:
-                termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+            while self._read_key() != b'\r':
+                pass
+    
+    def _read_key(self) -> bytes:
+        """Zwraca bajty jednego klawisza (POSIX), resztę odczytu zostawia na kolejne wywołania"""
+        # Terminal jest w trybie raw przez całą sesję (_enter_raw_mode), jeden
+        # odczyt może zawierać całą sekwencję (ESC [ A) albo kilka klawiszy naraz
+        if not self._pending:
+            self._pending = self._read_input()
+        
+        buf = self._pending
+        if buf[:1] != b'\x1b' or len(buf) == 1:
+            end = 1
+        elif buf[1:2] == b'O':
+            # SS3: ESC O i jeden znak
+            while len(buf) < 3:
+                buf += self._read_input()
+            end = 3
+        elif buf[1:2] == b'[':
+            # CSI: ESC [, parametry i bajt końcowy z zakresu 0x40-0x7E
+            end = 2
+            while True:
+                while end >= len(buf):
+                    buf += self._read_input()
+                if 0x40 <= buf[end] <= 0x7e:
+                    break
+                end += 1
+            end += 1
+        else:
+            # ESC, po którym jest inny klawisz - samo ESC
+            end = 1
+        
+        key, self._pending = buf[:end], buf[end:]
+        if key == b'\x03':
+            raise KeyboardInterrupt
+        return key
+    
+    @staticmethod
+    def _read_input() -> bytes:
+        """Odczytuje dostępne bajty ze stdin, koniec wejścia zgłasza jako EOFError"""
+        data = os.read(sys.stdin.fileno(), 32)
+        if not data:
+            raise EOFError
+        return data
 
 
 def main():
     """Główna funkcja"""
     base_dir = Path(__file__).parent
+
+    if sys.platform == 'win32':
+        # Włącza obsługę sekwencji ANSI (VT) w konsoli Windows 10+
+        os.system('')
     
     # Wczytanie danych
     print("Wczytywanie pytań...")
-    questions = QuestionParser.parse_questions(base_dir / 'pyta_updated.dat')
+    questions = load_cached(base_dir / 'pyta_updated.dat', QuestionParser.parse_questions)
     print(f"Wczytano {len(questions)} pytań")
     
     print("Wczytywanie modułów...")
-    modules = ModuleLoader.load_modules(base_dir / 'moduly.json')
+    modules = load_cached(base_dir / 'moduly.json', ModuleLoader.load_modules)
     print(f"Wczytano {len(modules)} modułów")
     
     print()
@@ -442,27 +633,29 @@ def main():
     # Uruchomienie aplikacji
     quiz = Quiz(questions, modules)
     
-    while True:
-        result = quiz.select_mode()
-        
-        if result is None:
-            break
-        
-        question_ids, mode = result
-        
-        if not question_ids:
-            Quiz.clear_screen()
-            print("Brak pytań do nauki!")
-            continue
-        
-        quiz.quiz_questions = random.sample(question_ids, min(20, len(question_ids)))
-        quiz.run_quiz(question_ids)
+    try:
+        while True:
+            result = quiz.select_mode()
+            
+            if result is None:
+                break
+            
+            positions, mode = result
+            
+            if not positions:
+                quiz.clear_screen()
+                print("Brak pytań do nauki!")
+                continue
+            
+            quiz.run_quiz(positions)
+    finally:
+        quiz.restore_terminal()
 
 
 if __name__ == '__main__':
     try:
         main()
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, EOFError):
         print("\n\nWyjście z aplikacji.")
         sys.exit(0)
     except Exception as e: